@@ -1,21 +1,19 @@
 from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait, Select
+from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from bs4 import BeautifulSoup
-import pandas as pd
+import aiohttp
+import csv
+import asyncio
+from aiohttp_client_cache import CachedSession, SQLiteBackend
+import lxml.html
 import re
 import logging
 from datetime import datetime
 import os
-import multiprocessing
-import concurrent.futures
-from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
-from functools import partial
-import queue
-import threading
-import time
-from senate_vote_scrapper import SenateScraper
+from senate_vote_scrapper import (
+    SenateScraper, VOTE_COLUMNS, CHROME_SPEED_ARGUMENTS, vote_rows, parse_vote_page
+)
 
 # Configure logging with thread safety
 logging.basicConfig(
@@ -24,64 +22,143 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Default upper bound on simultaneous page requests against senate.gov
+MAX_CONCURRENT_REQUESTS = 64
+
+# Year menu entries, e.g. "2024 (118th, 2nd)"
+_YEAR_RE = re.compile(r'(\d{4})\s+\((\d+)(?:st|nd|rd|th),\s+(\d)(?:st|nd|rd|th)\)')
+
+# On-disk HTTP cache so re-runs skip pages that were already downloaded
+CACHE_PATH = 'senate_cache.sqlite'
+# Cache lifetime for the current year's pages (seconds), including its vote
+# list; past years never expire
+CURRENT_YEAR_EXPIRE_AFTER = 3600
+
 def setup_driver():
     """Create a new browser instance with appropriate options."""
     options = webdriver.ChromeOptions()
-    options.add_argument('--headless')
+    options.add_argument('--headless=new')
     options.add_argument('--no-sandbox')
     options.add_argument('--disable-dev-shm-usage')
-    options.add_argument('--disable-gpu')
     options.add_argument('--log-level=3')
+    for argument in CHROME_SPEED_ARGUMENTS:
+        options.add_argument(argument)
     options.add_experimental_option('excludeSwitches', ['enable-logging'])
+    options.add_experimental_option(
+        'prefs', {"profile.managed_default_content_settings.images": 2}
+    )
+    options.page_load_strategy = 'eager'
     return webdriver.Chrome(options=options)
 
-def scrape_single_vote(vote_url, year_info):
-    """Scrape a single vote page."""
-    driver = setup_driver()
+async def fetch_vote(session, semaphore, vote_url, expire_after=-1):
+    """Download and parse a single vote page, going through the session's cache."""
     try:
-        driver.get(vote_url)
-        soup = BeautifulSoup(driver.page_source, 'html.parser')
+        async with semaphore:
+            async with session.get(vote_url, expire_after=expire_after) as response:
+                response.raise_for_status()
+                html = await response.read()
+                encoding = response.get_encoding()
+        # Decode with the header charset, as a browser would
+        page = parse_vote_page(html, encoding)
         
         # Parse vote details and records
-        vote_info = SenateScraper.parse_vote_details(None, soup)
-        voting_records = SenateScraper.parse_voting_records(None, soup)
+        vote_info = SenateScraper.parse_vote_details(None, page)
+        voting_records = SenateScraper.parse_voting_records(None, page)
         
         if voting_records:
-            df = SenateScraper.create_vote_dataset(None, voting_records, vote_info)
-            return df
+            return vote_info, voting_records
         return None
     except Exception as e:
         logger.error(f"Error scraping vote {vote_url}: {e}")
         return None
-    finally:
-        driver.quit()
 
-def get_vote_links(driver, url):
-    """Get all vote links from a year page."""
-    try:
-        driver.get(url)
-        wait = WebDriverWait(driver, 10)
+def _expire_after(year):
+    """Cache lifetime for a year's pages: past years never change."""
+    if int(year) < datetime.now().year:
+        return -1
+    return CURRENT_YEAR_EXPIRE_AFTER
+
+class _YearWriter:
+    """Streams one year's votes to its CSV as they arrive.
+    
+    Votes finish out of order, so early ones are held back and rows keep the
+    vote list order. Everything runs on one event loop, so no lock is needed.
+    Rows go to a .part file that only replaces the year's CSV once at least
+    one vote was written, so a failed re-run keeps the previous file.
+    """
+    
+    def __init__(self, year, csv_path, vote_links):
+        self.year = year
+        self.csv_path = csv_path
+        self.vote_links = vote_links
+        self.vote_count = 0
+        self.record_count = 0
+        self._finished = {}
+        self._next_index = 0
+        self._part_path = csv_path + '.part'
+        self._file = open(self._part_path, 'w', buffering=1 << 20, newline='', encoding='utf-8')
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(VOTE_COLUMNS)
+    
+    def add(self, index, vote):
+        """Record a fetched vote (or None) and write every vote now in order."""
+        if index < self._next_index:
+            return
+        self._finished.setdefault(index, vote)
+        while self._next_index in self._finished:
+            vote = self._finished.pop(self._next_index)
+            url = self.vote_links[self._next_index]
+            self._next_index += 1
+            if vote is None:
+                continue
+            
+            vote_info, voting_records = vote
+            self._writer.writerows(vote_rows(vote_info, voting_records))
+            self.vote_count += 1
+            self.record_count += len(voting_records)
+            logger.info(f"Successfully processed vote from {url}")
+    
+    def close(self):
+        """Close the CSV; return (csv_path, vote_count, record_count) or None."""
+        self._file.close()
+        if not self.vote_count:
+            os.remove(self._part_path)
+            return None
         
-        # Wait for and select 'All' from dropdown
-        dropdown = wait.until(
-            EC.presence_of_element_located((By.NAME, "listOfVotes_length"))
-        )
-        Select(dropdown).select_by_value('-1')
-        time.sleep(2)  # Wait for table update
+        os.replace(self._part_path, self.csv_path)
         
-        # Get all vote links
-        table = wait.until(EC.presence_of_element_located((By.ID, "listOfVotes")))
-        links = table.find_elements(By.CSS_SELECTOR, "td:first-child a")
-        return [link.get_attribute('href') for link in links]
+        logger.info(f"Saved {self.vote_count} votes for year {self.year}")
+        return self.csv_path, self.vote_count, self.record_count
+
+async def fetch_vote_links(session, semaphore, url, expire_after=-1):
+    """Get all vote links from a year's vote list page.
+    
+    Every row is already in the served HTML, so the page is read over HTTP
+    rather than paginated to 'All' in a browser.
+    """
+    try:
+        async with semaphore:
+            async with session.get(url, expire_after=expire_after) as response:
+                response.raise_for_status()
+                html = await response.read()
+                encoding = response.get_encoding()
+        tree = lxml.html.fromstring(html, parser=lxml.html.HTMLParser(encoding=encoding))
+        return SenateScraper.parse_vote_links(None, tree, url)
     except Exception as e:
         logger.error(f"Error getting vote links from {url}: {e}")
         return []
 
 class ParallelSenateScraper:
-    def __init__(self, max_workers=None):
-        """Initialize the parallel scraper with configurable workers."""
+    def __init__(self, max_year_workers=2, max_vote_workers=MAX_CONCURRENT_REQUESTS):
+        """Initialize the parallel scraper with separate concurrency limits.
+        
+        max_year_workers bounds how many vote list pages are fetched at once
+        and max_vote_workers is the number of vote page workers (and the cap
+        on in-flight HTTP requests) shared by all years.
+        """
         self.base_url = "https://www.senate.gov"
-        self.max_workers = max_workers or multiprocessing.cpu_count()
+        self.max_year_workers = max_year_workers
+        self.max_vote_workers = max_vote_workers
         
     def get_year_links(self):
         """Get all available year links from the main votes page."""
@@ -98,13 +175,13 @@ class ParallelSenateScraper:
             for option in options:
                 value = option.get_attribute("value")
                 text = option.text
-                match = re.search(r'(\d{4})\s+\((\d+)(?:st|nd|rd|th),\s+(\d)(?:st|nd|rd|th)\)', text)
-                
+                match = _YEAR_RE.search(text)
+            
                 if match and value:
                     year, congress, session = match.groups()
                     if not value.startswith('http'):
                         value = f"{self.base_url}/legislative/LIS/roll_call_lists/vote_menu_{congress}_{session}.htm"
-                    
+                
                     year_links[year] = {
                         'url': value,
                         'congress': congress,
@@ -115,57 +192,34 @@ class ParallelSenateScraper:
         finally:
             driver.quit()
 
-    def process_year(self, year, year_info, output_dir):
-        """Process all votes for a specific year."""
-        driver = setup_driver()
-        try:
-            # Create year directory
-            year_dir = os.path.join(output_dir, year)
-            os.makedirs(year_dir, exist_ok=True)
-            
-            # Get vote links for the year
-            vote_links = get_vote_links(driver, year_info['url'])
-            logger.info(f"Found {len(vote_links)} votes for year {year}")
-            
-            if not vote_links:
-                return None
-            
-            # Process votes in parallel using ThreadPoolExecutor
-            all_votes_data = []
-            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-                future_to_url = {
-                    executor.submit(scrape_single_vote, url, year_info): url 
-                    for url in vote_links
-                }
-                
-                for future in concurrent.futures.as_completed(future_to_url):
-                    url = future_to_url[future]
-                    try:
-                        df = future.result()
-                        if df is not None:
-                            all_votes_data.append(df)
-                            logger.info(f"Successfully processed vote from {url}")
-                    except Exception as e:
-                        logger.error(f"Error processing {url}: {e}")
-            
-            if all_votes_data:
-                # Combine all votes and save
-                combined_df = pd.concat(all_votes_data, ignore_index=True)
-                
-                # Save to both CSV and Excel
-                csv_path = os.path.join(year_dir, f'senate_votes_{year}')
-                #excel_path = os.path.join(year_dir, f'senate_votes_{year}.xlsx')
-                
-                combined_df.to_csv(csv_path, index=False)
-                #combined_df.to_excel(excel_path, index=False)
-                
-                logger.info(f"Saved {len(all_votes_data)} votes for year {year}")
-                return combined_df
-            
-            return None
-            
-        finally:
-            driver.quit()
+    async def get_year_index(self, session, semaphore, year, year_info):
+        """Get the vote links listed on a year's vote list page."""
+        vote_links = await fetch_vote_links(
+            session, semaphore, year_info['url'], _expire_after(year)
+        )
+        logger.info(f"Found {len(vote_links)} votes for year {year}")
+        return vote_links
+
+    async def process_votes(self, session, semaphore, vote_queue):
+        """Worker: fetch queued vote pages and hand them to their year's writer.
+        
+        Items are (year_writer, index, url). Runs until cancelled.
+        """
+        while True:
+            year_writer, index, url = await vote_queue.get()
+            try:
+                vote = await fetch_vote(session, semaphore, url, _expire_after(year_writer.year))
+                year_writer.add(index, vote)
+            except Exception as e:
+                logger.error(f"Error processing vote {url}: {e}")
+                # Mark the slot as done, or every later vote of the year
+                # would wait behind it in the reorder buffer
+                try:
+                    year_writer.add(index, None)
+                except Exception as e:
+                    logger.error(f"Error skipping vote {url}: {e}")
+            finally:
+                vote_queue.task_done()
 
     def scrape_years(self, start_year, end_year, output_dir="senate_votes"):
         """Scrape multiple years in parallel."""
@@ -189,36 +243,87 @@ class ParallelSenateScraper:
             # Create output directory
             os.makedirs(output_dir, exist_ok=True)
             
-            # Process years in parallel using ProcessPoolExecutor
-            with ProcessPoolExecutor(max_workers=min(len(years_to_scrape), self.max_workers)) as executor:
-                future_to_year = {
-                    executor.submit(self.process_year, year, info, output_dir): year
-                    for year, info in years_to_scrape.items()
-                }
-                
-                for future in concurrent.futures.as_completed(future_to_year):
-                    year = future_to_year[future]
-                    try:
-                        df = future.result()
-                        if df is not None:
-                            vote_count = len(df[df['Section'] == 'Metadata'])
-                            record_count = len(df[df['Section'] == 'Vote'])
-                            logger.info(f"\nYear {year} Summary:")
-                            logger.info(f"  Total votes: {vote_count}")
-                            logger.info(f"  Total voting records: {record_count}")
-                    except Exception as e:
-                        logger.error(f"Error processing year {year}: {e}")
+            # Process all years on a single event loop
+            asyncio.run(self._scrape_years(years_to_scrape, output_dir))
             
         except Exception as e:
             logger.error(f"Error in scrape_years: {e}")
 
+    async def _scrape_years(self, years_to_scrape, output_dir):
+        """Scrape the years as one pipeline over a shared queue of vote pages.
+        
+        Every year's vote list is requested up front, and each year's vote
+        URLs are queued as soon as its list arrives, so workers start on one
+        year's votes while other lists are still loading.
+        """
+        semaphore = asyncio.Semaphore(self.max_vote_workers)
+        connector = aiohttp.TCPConnector(limit=self.max_vote_workers)
+        index_slots = asyncio.Semaphore(self.max_year_workers)
+        vote_queue = asyncio.Queue()
+        year_writers = {}
+        results = {}
+        
+        async def list_year(year, info):
+            async with index_slots:
+                vote_links = await self.get_year_index(session, semaphore, year, info)
+            if not vote_links:
+                results[year] = None
+                return
+            
+            year_dir = os.path.join(output_dir, year)
+            os.makedirs(year_dir, exist_ok=True)
+            csv_path = os.path.join(year_dir, f'senate_votes_{year}.csv')
+            year_writer = year_writers[year] = _YearWriter(year, csv_path, vote_links)
+            for index, url in enumerate(vote_links):
+                vote_queue.put_nowait((year_writer, index, url))
+        
+        cache = SQLiteBackend(CACHE_PATH, expire_after=-1)
+        async with CachedSession(cache=cache, connector=connector) as session:
+            workers = [
+                asyncio.create_task(self.process_votes(session, semaphore, vote_queue))
+                for _ in range(self.max_vote_workers)
+            ]
+            try:
+                listings = await asyncio.gather(
+                    *[list_year(year, info) for year, info in years_to_scrape.items()],
+                    return_exceptions=True
+                )
+                await vote_queue.join()
+            finally:
+                for worker in workers:
+                    worker.cancel()
+                await asyncio.gather(*workers, return_exceptions=True)
+                for year, year_writer in year_writers.items():
+                    results[year] = year_writer.close()
+        
+        for year, listing in zip(years_to_scrape, listings):
+            if isinstance(listing, Exception):
+                results[year] = listing
+        
+        total_votes = 0
+        total_records = 0
+        for year in years_to_scrape:
+            result = results.get(year)
+            if isinstance(result, Exception):
+                logger.error(f"Error processing year {year}: {result}")
+            elif result is not None:
+                csv_path, vote_count, record_count = result
+                total_votes += vote_count
+                total_records += record_count
+                logger.info(f"\nYear {year} Summary:")
+                logger.info(f"  Saved to: {csv_path}")
+                logger.info(f"  Total votes: {vote_count}")
+                logger.info(f"  Total voting records: {record_count}")
+        
+        logger.info(f"\nAll years: {total_votes} votes, {total_records} voting records")
+
 def main():
     try:
-        # Create scraper with default number of workers (CPU count)
+        # Create scraper with default concurrency limits
         scraper = ParallelSenateScraper()
         
-        # Or specify number of workers
-        scraper = ParallelSenateScraper(max_workers=4)
+        # Or tune years in parallel and in-flight requests separately
+        scraper = ParallelSenateScraper(max_year_workers=4, max_vote_workers=32)
         
         # Scrape votes for multiple years
         scraper.scrape_years(2015, 2025)
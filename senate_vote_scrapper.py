@@ -1,15 +1,23 @@
 from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import Select, WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException
-from bs4 import BeautifulSoup
-import pandas as pd
+from selenium.webdriver.support.ui import WebDriverWait
+import lxml.html
+from lxml import etree
+import polars as pl
 import logging
 import time
 import re
 from datetime import datetime
 import os
+import sys
+from collections import namedtuple
+import requests
+from urllib.parse import urljoin
+
+# google-re2 scans the senator list faster when installed; fall back to re
+try:
+    import re2 as _vote_re_engine
+except ImportError:
+    _vote_re_engine = re
 
 # Configure logging
 logging.basicConfig(
@@ -18,6 +26,260 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Chrome switches that skip work a scraper never needs (images, extensions,
+# background traffic, disk cache)
+CHROME_SPEED_ARGUMENTS = [
+    '--disable-extensions',
+    '--disable-background-networking',
+    '--disable-sync',
+    '--disable-translate',
+    '--disable-default-apps',
+    '--blink-settings=imagesEnabled=false',
+    '--disk-cache-size=0',
+]
+
+# One senator per line: Name (Party-State), Vote. The pattern avoids
+# backreferences and lookarounds so RE2 can run it as a linear-time DFA;
+# multiline mode is set inline because re2.compile takes no flags.
+# Horizontal whitespace is spelled out because RE2's \s is ASCII-only and
+# would miss the no-break spaces (&nbsp;) on the page.
+_HSPACE = r'[ \t\r\f\v\xa0]*'
+_VOTE_RE = _vote_re_engine.compile(
+    r'(?m)^' + _HSPACE + r'([^(\n]+?)' + _HSPACE + r'\(([DRI])-([A-Z]{2})\),' + _HSPACE
+    + r'(Yea|Nay|Not Voting|Present)' + _HSPACE + r'$'
+)
+
+# Amendment number in free text, e.g. "Amdt. No. 1388"
+_AMDT_RE = re.compile(r'(?:Amdt\.|Amendment)\s*(?:No\.)?\s*(\d+)')
+
+_VOTE_LINKS = etree.XPath("//table[@id='listOfVotes']//td[1]//a/@href")
+
+# A labelled div.contenttext: text of its first <b>, of its first <a>
+# (None without a link) and the div's full text
+ContentDiv = namedtuple('ContentDiv', ['label', 'link', 'text'])
+
+# Div classes VoteTarget captures
+_CAPTURED_CLASSES = {'contenttext', 'newspaperDisplay_3column'}
+
+class VoteTarget:
+    """lxml parser target that keeps only the parts of a vote page we read.
+    
+    Collects the labelled div.contenttext blocks and the text of
+    div.newspaperDisplay_3column while the page is parsed, without building
+    an element tree for the rest of the document.
+    """
+    
+    def __init__(self):
+        self.content_divs = []
+        self.voting_text = None
+        self._capture = None
+        self._depth = 0
+        self._parts = []
+        self._label = None
+        self._link = None
+        self._in_b = False
+        self._in_a = False
+    
+    def start(self, tag, attrs):
+        if self._capture is None:
+            if tag != 'div':
+                return
+            # Match class tokens, so e.g. class="contenttext left" still counts
+            captured = _CAPTURED_CLASSES.intersection(attrs.get('class', '').split())
+            if captured:
+                self._capture = captured.pop()
+                self._depth = 0
+                self._parts = []
+                self._label = None
+                self._link = None
+            return
+        
+        if tag == 'div':
+            self._depth += 1
+        elif tag == 'b' and self._label is None:
+            self._in_b = True
+            self._label = []
+        elif tag == 'a' and self._link is None:
+            self._in_a = True
+            self._link = []
+    
+    def end(self, tag):
+        if self._capture is None:
+            return
+        
+        if tag == 'b':
+            self._in_b = False
+        elif tag == 'a':
+            self._in_a = False
+        elif tag == 'div':
+            if self._depth:
+                self._depth -= 1
+                return
+            
+            text = ''.join(self._parts)
+            if self._capture == 'newspaperDisplay_3column':
+                if self.voting_text is None:
+                    self.voting_text = text
+            elif self._label is not None:
+                link = ''.join(self._link) if self._link is not None else None
+                self.content_divs.append(ContentDiv(''.join(self._label), link, text))
+            self._capture = None
+    
+    def data(self, data):
+        if self._capture is None:
+            return
+        
+        self._parts.append(data)
+        if self._in_b:
+            self._label.append(data)
+        if self._in_a:
+            self._link.append(data)
+    
+    def close(self):
+        return self
+
+def parse_vote_page(html, encoding=None):
+    """Parse a vote page's HTML (str or bytes) into a VoteTarget.
+    
+    For bytes, pass the charset from the HTTP headers as `encoding`;
+    otherwise lxml has to guess it from the document.
+    """
+    parser = etree.HTMLParser(target=VoteTarget(), encoding=encoding)
+    return etree.fromstring(html, parser)
+
+def _labeled_text(by_label, label):
+    """Return the text following `label` in the first div carrying that label."""
+    div = by_label.get(label)
+    if div is None:
+        return None
+    return div.text.split(f'{label}:')[1].strip()
+
+def _handle_vote_date(vote_info, div, by_label):
+    """Read the vote date."""
+    vote_info['date'] = div.text.split('Vote Date:')[1].strip()
+
+def _handle_vote_result(vote_info, div, by_label):
+    """Read the vote result."""
+    vote_info['result'] = div.text.split('Vote Result:')[1].strip()
+
+def _handle_amendment(vote_info, div, by_label):
+    """Read an amendment number and its statement of purpose."""
+    if div.link is not None:
+        vote_info['measure_number'] = div.link.strip()
+    else:
+        # Try to extract from text if no link
+        amdt_match = _AMDT_RE.search(div.text)
+        if amdt_match:
+            vote_info['measure_number'] = f"S.Amdt. {amdt_match.group(1)}"
+    
+    # Amendment title comes from the Statement of Purpose
+    purpose = _labeled_text(by_label, 'Statement of Purpose')
+    if purpose is not None:
+        vote_info['measure_title'] = purpose
+
+def _handle_measure(vote_info, div, by_label):
+    """Read a measure number and its title."""
+    if div.link is not None:
+        vote_info['measure_number'] = div.link.strip()
+    
+    title = _labeled_text(by_label, 'Measure Title')
+    if title is not None:
+        vote_info['measure_title'] = title
+
+def _handle_nomination(vote_info, div, by_label):
+    """Record a nomination vote."""
+    vote_info['measure_number'] = 'NOMINATION'
+    vote_info['measure_title'] = div.text.split(':', 1)[1].strip()
+
+def _handle_question(vote_info, div, by_label):
+    """Fall back to the question when nothing more specific was found."""
+    if vote_info['measure_number'] == 'N/A':
+        vote_info['measure_number'] = 'QUESTION'
+        vote_info['measure_title'] = div.text.split('Question:', 1)[1].strip()
+
+# Vote page labels (without the trailing colon) and how to read them
+_DETAIL_HANDLERS = {
+    'Vote Date': _handle_vote_date,
+    'Vote Result': _handle_vote_result,
+    'Amendment Number': _handle_amendment,
+    'Measure Number': _handle_measure,
+    'Nomination': _handle_nomination,
+    'Nominee': _handle_nomination,
+    'Question': _handle_question,
+}
+
+VOTE_COLUMNS = [
+    'Section', 'Date', 'Result', 'Measure_Number', 'Measure_Title',
+    'Senator', 'Party', 'State', 'Vote'
+]
+
+def vote_rows(vote_info, voting_records):
+    """Return the CSV rows for one vote: its metadata row, then one row per senator."""
+    rows = [(
+        'Metadata', vote_info['date'], vote_info['result'],
+        vote_info['measure_number'], vote_info['measure_title'], '', '', '', ''
+    )]
+    rows.extend(
+        ('Vote', '', '', '', '', record['Senator'], record['Party'], record['State'], record['Vote'])
+        for record in voting_records
+    )
+    return rows
+
+_CATEGORICAL_COLUMNS = ('Section', 'Result', 'Party', 'State', 'Vote')
+
+def build_vote_dataframe(votes):
+    """Build one dataset from (vote_info, voting_records) pairs.
+    
+    Each vote contributes a metadata row followed by its senator rows. Rows are
+    accumulated column by column and turned into a Polars DataFrame once at the end,
+    instead of creating and concatenating small DataFrames per vote.
+    """
+    try:
+        columns = {col: [] for col in VOTE_COLUMNS}
+        (sections, dates, results, measure_numbers, measure_titles,
+         senators, parties, states, vote_casts) = columns.values()
+        
+        for vote_info, voting_records in votes:
+            if not voting_records:
+                continue
+            
+            # Metadata row; blank cells are None, since Polars writes '' as ""
+            sections.append('Metadata')
+            dates.append(vote_info['date'] or None)
+            results.append(vote_info['result'] or None)
+            measure_numbers.append(vote_info['measure_number'] or None)
+            measure_titles.append(vote_info['measure_title'] or None)
+            senators.append(None)
+            parties.append(None)
+            states.append(None)
+            vote_casts.append(None)
+            
+            # Senator rows, with the metadata columns left empty
+            blanks = [None] * len(voting_records)
+            sections.extend(['Vote'] * len(voting_records))
+            dates.extend(blanks)
+            results.extend(blanks)
+            measure_numbers.extend(blanks)
+            measure_titles.extend(blanks)
+            for record in voting_records:
+                senators.append(record['Senator'])
+                parties.append(record['Party'])
+                states.append(record['State'])
+                vote_casts.append(record['Vote'])
+        
+        # Low-cardinality columns are stored as categoricals
+        return pl.DataFrame(columns).with_columns(
+            pl.col(_CATEGORICAL_COLUMNS).cast(pl.Categorical)
+        )
+        
+    except Exception as e:
+        logger.error(f"Error creating vote dataset: {e}")
+        return None
+
+def write_vote_csv(df, csv_path):
+    """Write a vote dataset to CSV with Polars' multithreaded writer."""
+    df.write_csv(csv_path)
+
 class SenateScraper:
     def __init__(self, year="2024"):
         """Initialize the scraper with the target year."""
@@ -28,10 +290,13 @@ class SenateScraper:
     def setup_driver(self):
         """Set up Chrome WebDriver with appropriate options."""
         options = webdriver.ChromeOptions()
-        options.add_argument('--headless')
+        options.add_argument('--headless=new')
         options.add_argument('--no-sandbox')
         options.add_argument('--disable-dev-shm-usage')
+        for argument in CHROME_SPEED_ARGUMENTS:
+            options.add_argument(argument)
         options.add_experimental_option('excludeSwitches', ['enable-logging'])
+        options.page_load_strategy = 'eager'
         self.driver = webdriver.Chrome(options=options)
         self.wait = WebDriverWait(self.driver, 10)
         
@@ -40,36 +305,27 @@ class SenateScraper:
         if hasattr(self, 'driver'):
             self.driver.quit()
 
-    def show_all_votes(self):
-        """Select 'All' from the dropdown to display all votes."""
-        try:
-            dropdown = self.wait.until(
-                EC.presence_of_element_located((By.NAME, "listOfVotes_length"))
-            )
-            Select(dropdown).select_by_value('-1')
-            time.sleep(2)  # Wait for table to update
-            return True
-        except TimeoutException:
-            logger.error("Timeout waiting for dropdown menu")
-            return False
-        except Exception as e:
-            logger.error(f"Error showing all votes: {e}")
-            return False
-
-    def get_vote_links(self):
-        """Extract all vote links from the main table."""
+    def get_vote_links(self, url):
+        """Download the vote list page and extract every vote link.
+        
+        The table rows are rendered server-side; the 'All' dropdown only
+        paginates on the client, so no browser is needed here.
+        """
         try:
-            table = self.wait.until(
-                EC.presence_of_element_located((By.ID, "listOfVotes"))
-            )
-            links = table.find_elements(By.CSS_SELECTOR, "td:first-child a")
-            return [link.get_attribute('href') for link in links]
+            response = requests.get(url, timeout=10)
+            response.raise_for_status()
+            tree = lxml.html.fromstring(response.content)
+            return self.parse_vote_links(tree, url)
         except Exception as e:
             logger.error(f"Error getting vote links: {e}")
             return []
 
-    def parse_vote_details(self, soup):
-        """Extract vote metadata from the page, handling various vote types."""
+    def parse_vote_links(self, tree, page_url):
+        """Return absolute URLs of the votes listed in a parsed vote list page."""
+        return [urljoin(page_url, href) for href in _VOTE_LINKS(tree)]
+
+    def parse_vote_details(self, page):
+        """Extract vote metadata from a parsed vote page, handling various vote types."""
         vote_info = {
             'date': 'N/A',
             'result': 'N/A',
@@ -78,66 +334,19 @@ class SenateScraper:
         }
         
         try:
-            content_divs = soup.find_all('div', class_='contenttext')
+            # Index the first div per label for O(1) title lookups
+            labeled_divs = []
+            by_label = {}
+            for div in page.content_divs:
+                label = div.label.strip().rstrip(':')
+                labeled_divs.append((label, div))
+                by_label.setdefault(label, div)
             
-            # First pass: Get basic vote information
-            for div in content_divs:
-                if div.find('b'):
-                    b_text = div.find('b').text.strip()
-                    if 'Vote Date:' in b_text:
-                        vote_info['date'] = div.text.split('Vote Date:')[1].strip()
-                    elif 'Vote Result:' in b_text:
-                        vote_info['result'] = div.text.split('Vote Result:')[1].strip()
-            
-            # Second pass: Get measure number and title based on type
-            for div in content_divs:
-                if not div.find('b'):
-                    continue
-                    
-                b_text = div.find('b').text.strip()
-                
-                # Handle Amendment
-                if 'Amendment Number:' in b_text:
-                    # Get amendment number
-                    amdt_link = div.find('a')
-                    if amdt_link:
-                        vote_info['measure_number'] = amdt_link.text.strip()
-                    else:
-                        # Try to extract from text if no link
-                        amdt_match = re.search(r'(?:Amdt\.|Amendment)\s*(?:No\.)?\s*(\d+)', div.text)
-                        if amdt_match:
-                            vote_info['measure_number'] = f"S.Amdt. {amdt_match.group(1)}"
-                    
-                    # Look for Statement of Purpose for amendment title
-                    for purpose_div in content_divs:
-                        if purpose_div.find('b') and 'Statement of Purpose:' in purpose_div.find('b').text:
-                            vote_info['measure_title'] = purpose_div.text.split('Statement of Purpose:')[1].strip()
-                            break
-                
-                # Handle Measure
-                elif 'Measure Number:' in b_text:
-                    measure_link = div.find('a')
-                    if measure_link:
-                        vote_info['measure_number'] = measure_link.text.strip()
-                    
-                    # Look for Measure Title
-                    for title_div in content_divs:
-                        if title_div.find('b') and 'Measure Title:' in title_div.find('b').text:
-                            vote_info['measure_title'] = title_div.text.split('Measure Title:')[1].strip()
-                            break
-                
-                # Handle Nomination
-                elif 'Nomination:' in b_text or 'Nominee:' in b_text:
-                    nomination_text = div.text.split(':', 1)[1].strip()
-                    vote_info['measure_number'] = 'NOMINATION'
-                    vote_info['measure_title'] = nomination_text
-                
-                # Handle Question (when no specific measure/amendment/nomination)
-                elif 'Question:' in b_text:
-                    question_text = div.text.split('Question:', 1)[1].strip()
-                    if vote_info['measure_number'] == 'N/A':
-                        vote_info['measure_number'] = 'QUESTION'
-                        vote_info['measure_title'] = question_text
+            # Dispatch on the label, in document order
+            for label, div in labeled_divs:
+                handler = _DETAIL_HANDLERS.get(label)
+                if handler is not None:
+                    handler(vote_info, div, by_label)
             
             # Clean up the results
             for key in vote_info:
@@ -156,34 +365,25 @@ class SenateScraper:
             logger.error(f"Error parsing vote details: {e}")
             return vote_info
 
-    def parse_voting_records(self, soup):
-        """Parse individual senator voting records."""
+    def parse_voting_records(self, page):
+        """Parse individual senator voting records from a parsed vote page."""
         try:
-            voting_records = []
-            voting_section = soup.find('div', class_='newspaperDisplay_3column')
+            content = page.voting_text
             
-            if not voting_section:
+            if content is None:
                 return None
                 
-            content = voting_section.get_text()
-            lines = content.strip().split('\n')
-            
-            for line in lines:
-                line = line.strip()
-                if not line:
-                    continue
-                    
-                # Pattern: Name (Party-State), Vote
-                match = re.match(r'([^(]+?)\s*\(([DRI])-([A-Z]{2})\),\s*(Yea|Nay|Not Voting|Present)$', line)
-                if match:
-                    voting_records.append({
-                        'Senator': match.group(1).strip(),
-                        'Party': match.group(2).strip(),
-                        'State': match.group(3).strip(),
-                        'Vote': match.group(4).strip()
-                    })
-            
-            return voting_records
+            # The same senators, parties and states recur on every vote, so
+            # intern them to share one string object per distinct value
+            return [
+                {
+                    'Senator': sys.intern(name.strip()),
+                    'Party': sys.intern(party),
+                    'State': sys.intern(state),
+                    'Vote': sys.intern(vote)
+                }
+                for name, party, state, vote in _VOTE_RE.findall(content)
+            ]
             
         except Exception as e:
             logger.error(f"Error parsing voting records: {e}")
@@ -191,47 +391,9 @@ class SenateScraper:
 
     def create_vote_dataset(self, voting_records, vote_info):
         """Create a structured dataset combining metadata and voting records."""
-        try:
-            if not voting_records:
-                return None
-            
-            # Create metadata row
-            metadata_row = {
-                'Section': 'Metadata',
-                'Date': vote_info['date'],
-                'Result': vote_info['result'],
-                'Measure_Number': vote_info['measure_number'],
-                'Measure_Title': vote_info['measure_title'],
-                'Senator': '',
-                'Party': '',
-                'State': '',
-                'Vote': ''
-            }
-            
-            # Convert voting records to DataFrame
-            vote_rows = pd.DataFrame(voting_records)
-            vote_rows.insert(0, 'Section', 'Vote')
-            
-            # Add empty columns for metadata
-            vote_rows['Date'] = ''
-            vote_rows['Result'] = ''
-            vote_rows['Measure_Number'] = ''
-            vote_rows['Measure_Title'] = ''
-            
-            # Combine metadata and votes
-            metadata_df = pd.DataFrame([metadata_row])
-            combined_df = pd.concat([metadata_df, vote_rows], ignore_index=True)
-            
-            # Ensure consistent column order
-            column_order = [
-                'Section', 'Date', 'Result', 'Measure_Number', 'Measure_Title',
-                'Senator', 'Party', 'State', 'Vote'
-            ]
-            return combined_df[column_order]
-            
-        except Exception as e:
-            logger.error(f"Error creating vote dataset: {e}")
+        if not voting_records:
             return None
+        return build_vote_dataframe([(vote_info, voting_records)])
 
     def scrape_votes(self, output_dir='senate_votes'):
         """Main function to scrape all Senate votes for the specified year."""
@@ -245,14 +407,9 @@ class SenateScraper:
             url = f"{self.base_url}/legislative/LIS/roll_call_lists/vote_menu_{congress_num}_{session_num}.htm"
             
             logger.info(f"Accessing main vote page: {url}")
-            self.driver.get(url)
-            
-            # Show all votes
-            if not self.show_all_votes():
-                return None
             
             # Get all vote links
-            vote_links = self.get_vote_links()
+            vote_links = self.get_vote_links(url)
             logger.info(f"Found {len(vote_links)} votes to process")
             
             all_votes_data = []
@@ -262,18 +419,15 @@ class SenateScraper:
                 try:
                     logger.info(f"Processing vote: {link}")
                     self.driver.get(link)
-                    soup = BeautifulSoup(self.driver.page_source, 'html.parser')
+                    page = parse_vote_page(self.driver.page_source)
                     
                     # Get vote details and records
-                    vote_info = self.parse_vote_details(soup)
-                    voting_records = self.parse_voting_records(soup)
+                    vote_info = self.parse_vote_details(page)
+                    voting_records = self.parse_voting_records(page)
                     
                     if voting_records:
-                        # Create dataset for this vote
-                        vote_df = self.create_vote_dataset(voting_records, vote_info)
-                        if vote_df is not None:
-                            all_votes_data.append(vote_df)
-                            logger.info(f"Successfully processed vote dated {vote_info['date']}")
+                        all_votes_data.append((vote_info, voting_records))
+                        logger.info(f"Successfully processed vote dated {vote_info['date']}")
                     
                     time.sleep(1)  # Be nice to the server
                     
@@ -283,13 +437,13 @@ class SenateScraper:
             
             if all_votes_data:
                 # Combine all votes into one DataFrame
-                combined_df = pd.concat(all_votes_data, ignore_index=True)
+                combined_df = build_vote_dataframe(all_votes_data)
                 
                 # Save to both CSV and Excel
                 csv_path = os.path.join(output_dir, f'senate_votes_{self.year}.csv')
                 #excel_path = os.path.join(output_dir, f'senate_votes_{self.year}.xlsx')
                 
-                combined_df.to_csv(csv_path, index=False)
+                write_vote_csv(combined_df, csv_path)
                 #combined_df.to_excel(excel_path, index=False)
                 
                 logger.info(f"Saved {len(all_votes_data)} votes to {csv_path}")
@@ -314,12 +468,14 @@ if __name__ == "__main__":
         if df is not None:
             # Display summary statistics
             print("\nDataset Summary:")
-            print(f"Total votes processed: {len(df[df['Section'] == 'Metadata'])}")
-            print(f"Total voting records: {len(df[df['Section'] == 'Vote'])}")
+            metadata = df.filter(pl.col('Section') == 'Metadata')
+            votes = df.filter(pl.col('Section') == 'Vote')
+            print(f"Total votes processed: {metadata.height}")
+            print(f"Total voting records: {votes.height}")
             print("\nVotes by party:")
-            print(df[df['Section'] == 'Vote']['Party'].value_counts())
+            print(votes['Party'].value_counts(sort=True))
             print("\nVotes by result:")
-            print(df[df['Section'] == 'Metadata']['Result'].value_counts())
+            print(metadata['Result'].value_counts(sort=True))
         else:
             print("No data was collected")
             
@@ -0,0 +1,56 @@
+import re
+import unittest
+
+from senate_vote_scrapper import _VOTE_RE, SenateScraper, parse_vote_page
+
+try:
+    import re2
+except ImportError:
+    re2 = None
+
+VOTING_TEXT = (
+    'Luján (D-NM), Yea\xa0\n'
+    '\xa0Alexander (R-TN),\xa0Nay\n'
+    'Baldwin (D-WI), Not Voting \n'
+)
+
+EXPECTED_VOTES = [
+    ('Luján', 'D', 'NM', 'Yea'),
+    ('Alexander', 'R', 'TN', 'Nay'),
+    ('Baldwin', 'D', 'WI', 'Not Voting'),
+]
+
+class VoteLineTest(unittest.TestCase):
+    def test_nbsp_lines_match_with_re(self):
+        self.assertEqual(re.compile(_VOTE_RE.pattern).findall(VOTING_TEXT), EXPECTED_VOTES)
+
+    @unittest.skipIf(re2 is None, "google-re2 is not installed")
+    def test_re2_matches_re(self):
+        self.assertEqual(
+            re2.compile(_VOTE_RE.pattern).findall(VOTING_TEXT),
+            re.compile(_VOTE_RE.pattern).findall(VOTING_TEXT)
+        )
+
+class VotePageTest(unittest.TestCase):
+    def test_multi_class_divs_are_parsed(self):
+        html = (
+            '<html><body>'
+            '<div class="contenttext left"><b>Vote Result:</b> Bill Passed</div>'
+            '<div class="newspaperDisplay_3column wide">'
+            'Luj&aacute;n (D-NM), Yea&nbsp;<br>\nAlexander (R-TN), Nay'
+            '</div>'
+            '</body></html>'
+        )
+        page = parse_vote_page(html)
+
+        vote_info = SenateScraper.parse_vote_details(None, page)
+        self.assertEqual(vote_info['result'], 'Bill Passed')
+
+        voting_records = SenateScraper.parse_voting_records(None, page)
+        self.assertEqual(
+            [(r['Senator'], r['Vote']) for r in voting_records],
+            [('Luján', 'Yea'), ('Alexander', 'Nay')]
+        )
+
+if __name__ == '__main__':
+    unittest.main()
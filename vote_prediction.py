@@ -1,74 +1,233 @@
 import pandas as pd
 import numpy as np
 from sklearn.model_selection import train_test_split
-from sklearn.ensemble import RandomForestClassifier
+from sklearn.ensemble import HistGradientBoostingClassifier
+from sklearn.inspection import permutation_importance
 from sklearn.metrics import classification_report
-import seaborn as sns
-import matplotlib.pyplot as plt
-from datetime import datetime
-import re
 import glob
+import argparse
+from concurrent.futures import ThreadPoolExecutor
 
-def calculate_senator_history(df, current_measure):
-    """Calculate historical voting patterns for senators before the current measure"""
-    current_date = pd.to_datetime(df[df['Measure_Number'] == current_measure]['Date'].iloc[0])
-    previous_votes = df[pd.to_datetime(df['Date']) < current_date]
+# pyarrow's multithreaded CSV reader when installed, pandas' C parser otherwise
+try:
+    import pyarrow  # noqa: F401
+    CSV_ENGINE = 'pyarrow'
+except ImportError:
+    CSV_ENGINE = 'c'
+
+# Numba compiles the senator agreement kernel when installed
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# Format of the Date column written by the scrapers
+DATE_FORMAT = "%B %d, %Y, %I:%M %p"
+
+# A result containing any of these counts as the measure passing
+PASS_KEYWORDS = ('Agreed', 'Passed', 'Confirmed')
+
+# CSV columns the features are built from
+CSV_COLUMNS = ['Date', 'Result', 'Measure_Number', 'Measure_Title', 'Senator', 'Vote']
+
+# Features the model treats as categories rather than numbers
+CATEGORICAL_FEATURES = [
+    'fiscal_quarter', 'is_late_night', 'is_weekend', 'is_appropriation',
+    'is_amendment', 'is_authorization', 'is_emergency'
+]
+
+# Features describing the votes before a measure, in output order
+HISTORY_FEATURES = [
+    'avg_historical_yea_rate', 'avg_historical_participation',
+    'senator_agreement_score', 'active_senators',
+    'prev_measures_count', 'prev_pass_rate', 'similar_type_pass_rate'
+]
+
+# int8 codes for the votes the scrapers record; missing or unknown is -1
+VOTE_CODES = {'Nay': 0, 'Yea': 1, 'Not Voting': 2, 'Present': 3}
+
+# Low-cardinality string columns, stored as categoricals
+CATEGORY_COLUMNS = ['Senator', 'Vote', 'Result', 'Measure_Number']
+
+def load_votes(files):
+    """Load the scraped vote CSVs into one DataFrame"""
+    def read(path):
+        return pd.read_csv(path, engine=CSV_ENGINE, usecols=CSV_COLUMNS)
+    
+    # The parsers release the GIL, so the files load in parallel threads
+    with ThreadPoolExecutor() as executor:
+        frames = list(executor.map(read, files))
+    df = pd.concat(frames, ignore_index=True)
+    df['DateParsed'] = pd.to_datetime(df['Date'], format=DATE_FORMAT, cache=True)
+    # Measure type, e.g. "S" for "S.Amdt. 2918" or "H" for "H.R. 22"
+    df['MeasurePrefix'] = df['Measure_Number'].str.split('.', n=1).str[0].astype('category')
+    # Integer codes, so the feature code never compares strings
+    df['VoteCode'] = df['Vote'].map(VOTE_CODES).fillna(-1).astype('int8')
+    for col in CATEGORY_COLUMNS:
+        df[col] = df[col].astype('category')
+    df['PassCode'] = passed_mask(df['Result']).astype('int8')
+    return df
+
+def passed_mask(results):
+    """Boolean Series marking the results that count as the measure passing"""
+    # There are only a few distinct results, so check each one once and
+    # match the rows against the passing set
+    pass_set = {
+        result for result in results.dropna().unique()
+        if any(keyword in result for keyword in PASS_KEYWORDS)
+    }
+    return results.isin(pass_set)
+
+class HistoryCounts:
+    """Running totals over the records dated before the current measure
+    
+    Every historical feature is a ratio of these counts, so they are all
+    updated together from each batch of new records. Prefix and senator
+    totals are arrays indexed by category code.
+    """
+    
+    def __init__(self, n_senators, n_prefixes):
+        self.records = 0
+        self.passed = 0
+        self.prefix_records = np.zeros(n_prefixes, dtype=np.int64)
+        self.prefix_passed = np.zeros(n_prefixes, dtype=np.int64)
+        self.senator_yea = np.zeros(n_senators, dtype=np.int64)
+        self.senator_participated = np.zeros(n_senators, dtype=np.int64)
+        self.senator_votes = np.zeros(n_senators, dtype=np.int64)
     
-    if len(previous_votes) == 0:
-        return {}, 0
+    def add(self, senators, yea, participated, passed, prefixes):
+        """Add records, given as parallel arrays (senator/prefix codes, -1 missing)"""
+        self.records += len(passed)
+        self.passed += np.count_nonzero(passed)
+        
+        # Group the new records by prefix and by senator in one bincount each
+        has_prefix = prefixes >= 0
+        self.prefix_records += np.bincount(
+            prefixes[has_prefix], minlength=len(self.prefix_records)
+        )
+        self.prefix_passed += np.bincount(
+            prefixes[has_prefix & passed], minlength=len(self.prefix_passed)
+        )
+        has_senator = senators >= 0
+        self.senator_votes += np.bincount(
+            senators[has_senator], minlength=len(self.senator_votes)
+        )
+        self.senator_yea += np.bincount(
+            senators[has_senator & yea], minlength=len(self.senator_yea)
+        )
+        self.senator_participated += np.bincount(
+            senators[has_senator & participated], minlength=len(self.senator_participated)
+        )
+
+def calculate_senator_history(counts, agreement):
+    """Calculate historical voting patterns for senators from the votes before a measure
     
+    counts (a HistoryCounts) and agreement (a SenatorAgreement) hold the
+    running counts over those votes. Patterns are returned as arrays with
+    one entry per senator who has voted before.
+    """
     # Calculate senator voting patterns
-    senator_patterns = {}
-    for senator in df['Senator'].unique():
-        if pd.isna(senator):
-            continue
-            
-        senator_votes = previous_votes[previous_votes['Senator'] == senator]
-        if len(senator_votes) > 0:
-            yea_rate = (senator_votes['Vote'] == 'Yea').mean()
-            participation_rate = (senator_votes['Vote'] != 'Not Voting').mean()
-            senator_patterns[senator] = {
-                'historical_yea_rate': yea_rate,
-                'historical_participation': participation_rate,
-                'vote_count': len(senator_votes)
-            }
+    active = counts.senator_votes > 0
+    vote_count = counts.senator_votes[active]
+    senator_patterns = {
+        'historical_yea_rate': counts.senator_yea[active] / vote_count,
+        'historical_participation': counts.senator_participated[active] / vote_count,
+        'vote_count': vote_count
+    }
     
     # Calculate agreement scores between senators
-    if len(senator_patterns) > 0:
-        avg_agreement = calculate_senator_agreement(previous_votes)
+    if len(vote_count) > 0:
+        avg_agreement = agreement.score()
     else:
         avg_agreement = 0
         
     return senator_patterns, avg_agreement
 
-def calculate_senator_agreement(votes_df):
-    """Calculate average agreement between senators"""
-    agreement_scores = []
-    senators = votes_df['Senator'].unique()
+def _add_pair_counts(agree, common, codes, sign):
+    """Add (sign=1) or remove (sign=-1) one measure's votes from the pair counts
     
-    for i, sen1 in enumerate(senators[:-1]):
-        for sen2 in senators[i+1:]:
-            # Get common votes
-            votes1 = votes_df[votes_df['Senator'] == sen1].set_index('Measure_Number')['Vote']
-            votes2 = votes_df[votes_df['Senator'] == sen2].set_index('Measure_Number')['Vote']
-            
-            # Calculate agreement on common measures
-            common_measures = set(votes1.index) & set(votes2.index)
-            if common_measures:
-                agreement = sum((votes1[m] == votes2[m]) for m in common_measures) / len(common_measures)
-                agreement_scores.append(agreement)
+    Only the upper triangle (senator i < senator j) is updated.
+    """
+    n_senators = len(codes)
+    for i in range(n_senators):
+        if codes[i] < 0:
+            continue
+        for j in range(i + 1, n_senators):
+            if codes[j] < 0:
+                continue
+            common[i, j] += sign
+            if codes[i] == codes[j]:
+                agree[i, j] += sign
+
+def _add_pair_counts_numpy(agree, common, codes, sign):
+    """Vectorized _add_pair_counts for when Numba is not installed"""
+    present = codes >= 0
+    shared = np.triu(np.outer(present, present), k=1)
+    agree += sign * (shared & (codes[:, None] == codes[None, :]))
+    common += sign * shared
+
+if njit is not None:
+    _add_pair_counts = njit(_add_pair_counts)
+else:
+    _add_pair_counts = _add_pair_counts_numpy
+
+class SenatorAgreement:
+    """Running pairwise agreement between senators over the votes added so far
     
-    return np.mean(agreement_scores) if agreement_scores else 0
+    Senators, measures and votes are given as integer codes, -1 meaning
+    missing. Only a senator's first vote on each measure counts.
+    """
+    
+    def __init__(self, n_senators):
+        self.agree = np.zeros((n_senators, n_senators), dtype=np.int64)
+        self.common = np.zeros((n_senators, n_senators), dtype=np.int64)
+        self._pairs = np.triu_indices(n_senators, k=1)
+        self._measure_votes = {}
+    
+    def add_votes(self, measures, senators, votes):
+        """Add vote records, given as parallel code arrays"""
+        valid = (measures >= 0) & (senators >= 0) & (votes >= 0)
+        measures, senators, votes = measures[valid], senators[valid], votes[valid]
+        for measure in np.unique(measures):
+            on_measure = measures == measure
+            self._add_measure(measure, senators[on_measure], votes[on_measure])
+    
+    def _add_measure(self, measure, senators, votes):
+        """Fold new votes on one measure into the pair counts"""
+        measure_votes = self._measure_votes.get(measure)
+        if measure_votes is None:
+            measure_votes = np.full(len(self.agree), -1, dtype=votes.dtype)
+            self._measure_votes[measure] = measure_votes
+        else:
+            # Swap this measure's old contribution for its updated one
+            _add_pair_counts(self.agree, self.common, measure_votes, -1)
+        
+        senators, first = np.unique(senators, return_index=True)
+        votes = votes[first]
+        unset = measure_votes[senators] < 0
+        measure_votes[senators[unset]] = votes[unset]
+        
+        _add_pair_counts(self.agree, self.common, measure_votes, 1)
+    
+    def score(self):
+        """Calculate average agreement between senators"""
+        # Average over senator pairs with at least one measure in common
+        agree, common = self.agree[self._pairs], self.common[self._pairs]
+        has_common = common > 0
+        if not has_common.any():
+            return 0
+        return np.mean(agree[has_common] / common[has_common])
 
 def extract_quarter(month):
-    """Convert month to fiscal quarter"""
+    """Convert month (a number or an integer Series/array) to fiscal quarter"""
     return (month - 1) // 3 + 1
 
 def validate_data(df):
     """Validate input data"""
     if df.empty:
         raise ValueError("Empty dataframe")
-    required_cols = ['Date', 'Result', 'Measure_Number', 'Measure_Title', 'Senator', 'Vote']
+    required_cols = ['Date', 'DateParsed', 'MeasurePrefix', 'Result', 'PassCode',
+                     'Measure_Number', 'Measure_Title', 'Senator', 'Vote', 'VoteCode']
     missing = [col for col in required_cols if col not in df.columns]
     if missing:
         raise ValueError(f"Missing required columns: {missing}")
@@ -79,116 +238,190 @@ def prepare_enhanced_features(df):
     if not validate_data(df):
         return pd.DataFrame()
     
-    measures = []
-    for measure_num in df['Measure_Number'].unique():
-        if pd.isna(measure_num):
-            continue
-            
-        measure_data = df[df['Measure_Number'] == measure_num]
-        if len(measure_data) == 0:
-            continue
-            
-        # Get base features
-        feature_dict = {
-            'Measure_Number': measure_num
-        }
-        
-        # Time features
-        date_str = measure_data['Date'].iloc[0]
-        if pd.notna(date_str):
-            date_obj = datetime.strptime(date_str, "%B %d, %Y, %I:%M %p")
-            feature_dict.update({
-                'fiscal_quarter': extract_quarter(date_obj.month),
-                'hour': date_obj.hour,
-                'is_late_night': 1 if (date_obj.hour >= 22 or date_obj.hour <= 4) else 0,
-                'is_weekend': 1 if date_obj.weekday() >= 5 else 0,
-                'days_to_fiscal_end': (date_obj.replace(month=9, day=30) - date_obj).days % 365
-            })
-        
-        # Measure type features
-        measure_title = measure_data['Measure_Title'].iloc[0]
-        if pd.notna(measure_title):
-            title = str(measure_title).lower()
-            feature_dict.update({
-                'is_appropriation': 1 if 'appropriation' in title else 0,
-                'is_amendment': 1 if 'amendment' in title else 0,
-                'is_authorization': 1 if 'authorization' in title else 0,
-                'title_length': len(title),
-                'is_emergency': 1 if 'emergency' in title else 0
-            })
+    # One row per measure: its first record, in order of appearance
+    first = df.dropna(subset=['Measure_Number']).drop_duplicates('Measure_Number')
+    
+    # Time features
+    dates = first['DateParsed'].dropna()
+    hours = dates.dt.hour
+    fiscal_end = pd.to_datetime(
+        pd.DataFrame({'year': dates.dt.year, 'month': 9, 'day': 30})
+    )
+    time_features = pd.DataFrame({
+        'fiscal_quarter': extract_quarter(dates.dt.month).astype('int8'),
+        'hour': hours,
+        'is_late_night': ((hours >= 22) | (hours <= 4)).astype(int),
+        'is_weekend': (dates.dt.weekday >= 5).astype(int),
+        'days_to_fiscal_end': (fiscal_end - dates.dt.normalize()).dt.days % 365
+    })
+    
+    # Measure type features
+    titles = first['Measure_Title'].dropna().astype(str).str.lower()
+    title_features = pd.DataFrame({
+        'is_appropriation': titles.str.contains('appropriation', regex=False).astype(int),
+        'is_amendment': titles.str.contains('amendment', regex=False).astype(int),
+        'is_authorization': titles.str.contains('authorization', regex=False).astype(int),
+        'title_length': titles.str.len(),
+        'is_emergency': titles.str.contains('emergency', regex=False).astype(int)
+    })
+    
+    # Dated rows in chronological order, so the votes before a measure are
+    # found by binary search
+    dated = df[df['DateParsed'].notna()].sort_values('DateParsed', kind='stable')
+    sorted_dates = dated['DateParsed'].to_numpy()
+    dated_passed = dated['PassCode'].to_numpy() == 1
+    vote_codes = dated['VoteCode'].to_numpy()
+    dated_yea = vote_codes == VOTE_CODES['Yea']
+    dated_participated = vote_codes != VOTE_CODES['Not Voting']
+    
+    # Integer codes for the running counts
+    senator_codes = dated['Senator'].astype('category').cat
+    n_senators = len(senator_codes.categories)
+    senator_codes = senator_codes.codes.to_numpy()
+    measure_codes = dated['Measure_Number'].astype('category').cat.codes.to_numpy()
+    prefix_codes = dated['MeasurePrefix'].astype('category').cat
+    prefix_lookup = {prefix: code for code, prefix in enumerate(prefix_codes.categories)}
+    n_prefixes = len(prefix_codes.categories)
+    prefix_codes = prefix_codes.codes.to_numpy()
+    
+    # Walk the measures in date order, so each one only adds the records
+    # dated since the one before it to the running senator counts
+    chronological = first.sort_values('DateParsed', kind='stable', na_position='first')
+    counts = HistoryCounts(n_senators, n_prefixes)
+    agreement = SenatorAgreement(n_senators)
+    n_counted = 0
+    
+    # One preallocated column per feature; measures without history stay NaN
+    history = {name: np.full(len(chronological), np.nan) for name in HISTORY_FEATURES}
+    for i, (prefix, current_date) in enumerate(zip(chronological['MeasurePrefix'],
+                                                   chronological['DateParsed'])):
+        # Everything dated before this measure is a contiguous prefix
+        if pd.isna(current_date):
+            n_previous = 0
+        else:
+            n_previous = np.searchsorted(sorted_dates, current_date.to_datetime64())
+        new_records = slice(n_counted, n_previous)
+        counts.add(
+            senator_codes[new_records],
+            dated_yea[new_records],
+            dated_participated[new_records],
+            dated_passed[new_records],
+            prefix_codes[new_records]
+        )
+        agreement.add_votes(
+            measure_codes[new_records],
+            senator_codes[new_records],
+            vote_codes[new_records]
+        )
+        n_counted = n_previous
         
         # Historical senator patterns
-        senator_history, avg_agreement = calculate_senator_history(df, measure_num)
-        if senator_history:
+        senator_history, avg_agreement = calculate_senator_history(counts, agreement)
+        if len(senator_history['vote_count']) > 0:
             # Aggregate senator history
-            feature_dict.update({
-                'avg_historical_yea_rate': np.mean([s['historical_yea_rate'] 
-                                                  for s in senator_history.values()]),
-                'avg_historical_participation': np.mean([s['historical_participation'] 
-                                                       for s in senator_history.values()]),
-                'senator_agreement_score': avg_agreement,
-                'active_senators': len(senator_history)
-            })
+            history['avg_historical_yea_rate'][i] = senator_history['historical_yea_rate'].mean()
+            history['avg_historical_participation'][i] = (
+                senator_history['historical_participation'].mean()
+            )
+            history['senator_agreement_score'][i] = avg_agreement
+            history['active_senators'][i] = len(senator_history['vote_count'])
         
         # Historical patterns
-        previous_votes = df[pd.to_datetime(df['Date']) < pd.to_datetime(date_str)]
-        if len(previous_votes) > 0:
-            similar_type_votes = previous_votes[
-                previous_votes['Measure_Number'].str.startswith(
-                    str(measure_num).split('.')[0], na=False
-                )
-            ]
-            feature_dict.update({
-                'prev_measures_count': len(previous_votes),
-                'prev_pass_rate': (previous_votes['Result'].str.contains(
-                    'Agreed|Passed|Confirmed', na=False
-                )).mean(),
-                'similar_type_pass_rate': (similar_type_votes['Result'].str.contains(
-                    'Agreed|Passed|Confirmed', na=False
-                )).mean() if len(similar_type_votes) > 0 else 0
-            })
-        
-        # Target variable
-        feature_dict['Passed'] = 1 if measure_data['Result'].iloc[0] in df['Result'][
-            df['Result'].str.contains('Agreed|Passed|Confirmed', na=False)
-        ].unique() else 0
-        
-        measures.append(feature_dict)
-    
-    return pd.DataFrame(measures)
+        if counts.records > 0:
+            # A prefix that never appears in a dated row has no similar votes
+            prefix_code = prefix_lookup.get(prefix)
+            similar_type_count = (
+                counts.prefix_records[prefix_code] if prefix_code is not None else 0
+            )
+            history['prev_measures_count'][i] = counts.records
+            history['prev_pass_rate'][i] = counts.passed / counts.records
+            history['similar_type_pass_rate'][i] = (
+                counts.prefix_passed[prefix_code] / similar_type_count
+                if similar_type_count > 0 else 0
+            )
+    
+    # Features no measure had are left out, then rows go back to input order
+    history_features = pd.DataFrame(history, index=chronological.index)
+    history_features = history_features.dropna(axis=1, how='all').reindex(first.index)
+    
+    # Target variable
+    target = first['PassCode'].astype(int).rename('Passed')
+    
+    return pd.concat([
+        first[['Measure_Number']],
+        time_features,
+        title_features,
+        history_features,
+        target
+    ], axis=1).reset_index(drop=True)
 
 def train_model(X, y):
     """Train and evaluate the model"""
-    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+    # One contiguous float32 matrix; categorical columns are flagged by mask
+    categorical = X.columns.isin(CATEGORICAL_FEATURES)
+    X_values = np.ascontiguousarray(X.to_numpy(dtype=np.float32))
+    X_train, X_test, y_train, y_test = train_test_split(
+        X_values, y.to_numpy(), test_size=0.2, stratify=y, random_state=42
+    )
     
-    rf = RandomForestClassifier(
-        n_estimators=200, 
-        max_depth=10,
+    model = HistGradientBoostingClassifier(
+        categorical_features=categorical,
         random_state=42,
         class_weight='balanced'
     )
-    rf.fit(X_train, y_train)
+    model.fit(X_train, y_train)
+    
+    # Gradient boosting has no impurity importances, so measure how much
+    # shuffling each feature hurts the test score (one feature per core)
+    importance = permutation_importance(
+        model, X_test, y_test, n_repeats=10, random_state=42, n_jobs=-1
+    ).importances_mean
+    order = np.argsort(importance)[::-1]
     
     return {
-        'model': rf,
-        'train_score': rf.score(X_train, y_train),
-        'test_score': rf.score(X_test, y_test),
+        'model': model,
+        'train_score': model.score(X_train, y_train),
+        'test_score': model.score(X_test, y_test),
         'feature_importance': pd.DataFrame({
-            'feature': X.columns,
-            'importance': rf.feature_importances_
-        }).sort_values('importance', ascending=False),
+            'feature': X.columns[order],
+            'importance': importance[order]
+        }),
         'X_test': X_test,
         'y_test': y_test
     }
 
-def main():
+def plot_feature_importance(feature_importance, path='feature_importance.png'):
+    """Save a bar chart of the top 10 features"""
+    # Plotting libraries are slow to import, so only load them when asked to plot
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    
+    plt.figure(figsize=(12, 8))
+    top_10_features = feature_importance.head(10).nlargest(10, 'importance')
+    sns.barplot(
+        x='importance',
+        y='feature',
+        data=top_10_features
+    )
+    plt.title('Top 10 Most Important Features in Vote Prediction')
+    plt.tight_layout()
+    plt.savefig(path)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Predict Senate vote outcomes")
+    parser.add_argument(
+        '--plot', action='store_true',
+        help="save a feature importance chart to feature_importance.png"
+    )
+    args = parser.parse_args(argv)
+    
     try:
         print("Loading and processing data...")
         senate_votes_files = glob.glob('./senate_votes/*/*.csv')
         if not senate_votes_files:
             raise FileNotFoundError("No vote data files found")
             
-        df = pd.concat([pd.read_csv(f) for f in senate_votes_files], ignore_index=True)
+        df = load_votes(senate_votes_files)
         
         print("\n=== Creating Enhanced Features ===")
         features_df = prepare_enhanced_features(df)
@@ -224,16 +457,8 @@ def main():
         y_pred = results['model'].predict(results['X_test'])
         print(classification_report(results['y_test'], y_pred))
         
-        plt.figure(figsize=(12, 8))
-        top_10_features = results['feature_importance'].head(10).nlargest(10, 'importance')
-        sns.barplot(
-            x='importance',
-            y='feature',
-            data=top_10_features
-        )
-        plt.title('Top 10 Most Important Features in Vote Prediction')
-        plt.tight_layout()
-        plt.savefig('feature_importance.png')
+        if args.plot:
+            plot_feature_importance(results['feature_importance'])
         
     except Exception as e:
         print(f"Error: {str(e)}")